@@ -23,6 +23,7 @@ DNS_LOCK = threading.Lock()
 # Episode Cache
 EPISODE_CACHE = {}
 EPISODE_PATTERN = re.compile(r'/tv/(\d+)/season/(\d+)/episode/(\d+)$')
+EPISODE_SUFFIX_PATTERN = re.compile(r'/episode/\d+$')
 
 # IMDB Cache (Single Entry)
 IMDB_CACHE = {}
@@ -426,7 +427,7 @@ def process_single_request_with_cache(request):
         for i in range(8):
             curr_ep = start_ep + i
             # Reconstruct URL: replace the last number in the path
-            new_url = re.sub(r'/episode/\d+$', f'/episode/{curr_ep}', url)
+            new_url = EPISODE_SUFFIX_PATTERN.sub(f'/episode/{curr_ep}', url)
             
             req = request.copy()
             req['url'] = new_url
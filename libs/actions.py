@@ -28,7 +28,7 @@ import urllib.parse
 import xbmcgui
 import xbmcplugin
 from . import tmdb, data_utils
-from .utils import logger, safe_get
+from .utils import logger
 try:
     from typing import Optional, Text, Union, ByteString  # pylint: disable=unused-import
 except ImportError:
@@ -46,7 +46,7 @@ def find_show(title, year=None):
     search_results = tmdb.search_show(title, year)
     for search_result in search_results:
         show_name = search_result['name']
-        if safe_get(search_result, 'first_air_date') is not None:
+        if search_result.get('first_air_date') is not None:
             show_name += ' ({})'.format(search_result['first_air_date'][:4])
         list_item = xbmcgui.ListItem(show_name, offscreen=True)
         show_info = search_result
@@ -235,6 +235,9 @@ def router(paramstring):
     :raises RuntimeError: on unknown call action
     """
     params = dict(urllib.parse.parse_qsl(paramstring))
+    # the language invoker is reused, so drop state from a previous call
+    logger.refresh_debug_enabled()
+    data_utils._base_urls.cache_clear()
     # logger.info('----Called addon with params: {}'.format(params))
     logger.debug('Called addon with params: {}'.format(sys.argv))
     if params['action'] == 'find':
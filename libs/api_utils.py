@@ -152,12 +152,12 @@ def load_info(url, params=None, default=None, resp_type='json', verboselog=False
         sock.sendall(json.dumps(request_data).encode('utf-8'))
         
         # Read response
-        response_data = b""
+        response_data = bytearray()
         while True:
             chunk = sock.recv(4096)
             if not chunk:
                 break
-            response_data += chunk
+            response_data.extend(chunk)
             
         sock.close()
         
@@ -238,12 +238,12 @@ def load_info_batch(requests_list, default=None, resp_type='json', verboselog=Fa
         sock.sendall(json.dumps(request_data).encode('utf-8'))
         
         # Read response
-        response_data = b""
+        response_data = bytearray()
         while True:
             chunk = sock.recv(4096)
             if not chunk:
                 break
-            response_data += chunk
+            response_data.extend(chunk)
             
         sock.close()
         
@@ -24,6 +24,8 @@ from __future__ import absolute_import, unicode_literals
 
 import os
 import pickle
+import sqlite3
+import time
 import xbmc
 import xbmcvfs
 
@@ -46,6 +48,8 @@ def _get_cache_directory():  # pylint: disable=missing-docstring
 
 
 CACHE_DIR = _get_cache_directory()  # type: Text
+ID_CACHE_FILE = os.path.join(CACHE_DIR, 'idcache.db')  # type: Text
+ID_CACHE_MISS_TTL = 24 * 60 * 60  # seconds to remember external IDs TMDb doesn't know
 
 
 def cache_show_info(show_info):
@@ -79,3 +83,61 @@ def load_show_info_from_cache(show_id):
     except (IOError, pickle.PickleError) as exc:
         logger.debug('Cache message: {} {}'.format(type(exc), exc))
         return None
+
+
+def _open_id_cache():
+    # type: () -> sqlite3.Connection
+    conn = sqlite3.connect(ID_CACHE_FILE, timeout=10)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS idcache ('
+        'provider TEXT, ext_id TEXT, tmdb_id TEXT, ts INTEGER, '
+        'PRIMARY KEY (provider, ext_id))')
+    return conn
+
+
+def load_tmdb_id_from_cache(provider, ext_id):
+    # type: (Text, Text) -> Optional[Text]
+    """
+    Load a TMDb ID converted from an external ID from a local cache
+
+    :param provider: external ID type (imdb_id, tvdb_id)
+    :param ext_id: external ID
+    :return: TMDb ID, '' if TMDb recently had no match, or None if not cached
+    """
+    try:
+        conn = _open_id_cache()
+        try:
+            row = conn.execute(
+                'SELECT tmdb_id, ts FROM idcache WHERE provider = ? AND ext_id = ?',
+                (provider, str(ext_id))).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error as exc:
+        logger.debug('ID cache message: {} {}'.format(type(exc), exc))
+        return None
+    if row is None:
+        return None
+    tmdb_id, timestamp = row
+    if not tmdb_id and time.time() - timestamp > ID_CACHE_MISS_TTL:
+        return None
+    return tmdb_id
+
+
+def cache_tmdb_id(provider, ext_id, tmdb_id):
+    # type: (Text, Text, Optional[Text]) -> None
+    """
+    Save a TMDb ID converted from an external ID to a local cache
+
+    A falsy tmdb_id records that TMDb has no match for the external ID.
+    """
+    try:
+        conn = _open_id_cache()
+        try:
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO idcache VALUES (?, ?, ?, ?)',
+                    (provider, str(ext_id), str(tmdb_id or ''), int(time.time())))
+        finally:
+            conn.close()
+    except sqlite3.Error as exc:
+        logger.debug('ID cache message: {} {}'.format(type(exc), exc))
@@ -24,10 +24,14 @@ from __future__ import absolute_import, unicode_literals
 
 import re
 import json
+import socket
+import xbmcgui
+from functools import lru_cache
+from itertools import chain
 from xbmc import Actor, VideoStreamDetail
 from collections import namedtuple
-from .utils import safe_get, logger
-from . import settings, api_utils
+from .utils import logger
+from . import settings, api_utils, cache
 
 try:
     from typing import Optional, Tuple, Text, Dict, List, Any  # pylint: disable=unused-import
@@ -41,6 +45,8 @@ SOURCE_SETTINGS = settings.getSourceSettings()
 BASE_URL = 'https://api.themoviedb.org/3/{}'
 FIND_URL = BASE_URL.format('find/{}')
 TAG_RE = re.compile(r'<[^>]+>')
+NAMED_SEASON_RE = re.compile(
+    r'<namedseason number="(.*?)">(.*?)</namedseason>', re.I)
 
 # Regular expressions are listed in order of priority.
 # "TMDB" provider is preferred than other providers (IMDB and TheTVDB),
@@ -56,10 +62,15 @@ SHOW_ID_REGEXPS = (
     r'(thetvdb)\.com/api/.*series/(\d+)',                 # TheTVDB_http_link
     r'(thetvdb)\.com/.*?"id":(\d+)',                      # TheTVDB_http_link
 )
+_COMPILED_SHOW_ID_REGEXPS = tuple(
+    re.compile(regexp, re.I) for regexp in SHOW_ID_REGEXPS)
 
 
 SUPPORTED_ARTWORK_TYPES = {'poster', 'banner'}
 IMAGE_SIZES = ('large', 'original', 'medium')
+NO_IMAGE_URLS = (None, None)
+# TMDB image list names that differ from the Kodi art type
+ARTWORK_DESTINATIONS = {'posters': 'poster', 'logos': 'clearlogo'}
 CLEAN_PLOT_REPLACEMENTS = (
     ('<b>', '[B]'),
     ('</b>', '[/B]'),
@@ -68,11 +79,113 @@ CLEAN_PLOT_REPLACEMENTS = (
     ('</p><p>', '[CR]'),
 )
 VALIDEXTIDS = ['tmdb_id', 'imdb_id', 'tvdb_id']
+# TMDB returns crew jobs and departments in canonical case
+WRITER_JOBS = frozenset(('Writer', 'writer'))
+WRITING_DEPARTMENTS = frozenset(('Writing', 'writing'))
+# IDs typed as a search title; MEDIA_ID_TYPES maps each group to its type
+MEDIA_ID_RE = re.compile(
+    r'(tt\d+)'           # IMDB ID works alone because it is clear
+    r'|imdb/(tt\d+)'     # IMDB ID with prefix
+    r'|tmdb/(\d+)'       # TMDB ID
+    r'|tvdb/(\d+)')      # TVDB ID
+MEDIA_ID_TYPES = ('imdb_id', 'imdb_id', 'tmdb_id', 'tvdb_id')
+# 国家代码映射表 (ISO 3166-1 alpha-2 -> English Full Name)
+# 参考 library.py 中的映射逻辑
+COUNTRY_MAP = {
+    'CN': 'China',          # 内地
+    'HK': 'Hong Kong',      # 中国香港
+    'TW': 'Taiwan',         # 中国台湾
+    'US': 'United States',  # 美国
+    'JP': 'Japan',          # 日本
+    'KR': 'South Korea',    # 韩国
+    'TH': 'Thailand',       # 泰国
+    'IN': 'India',          # 印度
+    'GB': 'United Kingdom', # 英国
+    'FR': 'France',         # 法国
+    'DE': 'Germany',        # 德国
+    'RU': 'Russia',         # 俄罗斯
+    'CA': 'Canada',         # 加拿大
+    # 补充常见国家
+    'AU': 'Australia',      # 澳大利亚
+    'IT': 'Italy',          # 意大利
+    'ES': 'Spain',          # 西班牙
+    'BR': 'Brazil',         # 巴西
+    'MX': 'Mexico',         # 墨西哥
+    'SE': 'Sweden',         # 瑞典
+    'NO': 'Norway',         # 挪威
+    'DK': 'Denmark',        # 丹麦
+    'NL': 'Netherlands',    # 荷兰
+    'PL': 'Poland',         # 波兰
+    'TR': 'Turkey',         # 土耳其
+    'ID': 'Indonesia',      # 印度尼西亚
+    'PH': 'Philippines',    # 菲律宾
+    'SG': 'Singapore',      # 新加坡
+    'MY': 'Malaysia',       # 马来西亚
+    'VN': 'Vietnam',        # 越南
+    'ZA': 'South Africa',   # 南非
+    'NZ': 'New Zealand',    # 新西兰
+    'IE': 'Ireland',        # 爱尔兰
+    'BE': 'Belgium',        # 比利时
+    'CH': 'Switzerland',    # 瑞士
+    'AT': 'Austria',        # 奥地利
+    'FI': 'Finland',        # 芬兰
+    'PT': 'Portugal',       # 葡萄牙
+    'GR': 'Greece',         # 希腊
+    'IL': 'Israel',         # 以色列
+    'AR': 'Argentina',      # 阿根廷
+    'CL': 'Chile',          # 智利
+    'CO': 'Colombia',       # 哥伦比亚
+    'UA': 'Ukraine',        # 乌克兰
+    'CZ': 'Czech Republic', # 捷克
+    'HU': 'Hungary',        # 匈牙利
+    'RO': 'Romania',        # 罗马尼亚
+    # 更多国家补充
+    'AF': 'Afghanistan', 'AL': 'Albania', 'DZ': 'Algeria', 'AD': 'Andorra', 'AO': 'Angola',
+    'AG': 'Antigua and Barbuda', 'AM': 'Armenia', 'AZ': 'Azerbaijan', 'BS': 'Bahamas', 'BH': 'Bahrain',
+    'BD': 'Bangladesh', 'BB': 'Barbados', 'BY': 'Belarus', 'BZ': 'Belize', 'BJ': 'Benin',
+    'BT': 'Bhutan', 'BO': 'Bolivia', 'BA': 'Bosnia and Herzegovina', 'BW': 'Botswana', 'BN': 'Brunei Darussalam',
+    'BG': 'Bulgaria', 'BF': 'Burkina Faso', 'BI': 'Burundi', 'KH': 'Cambodia', 'CM': 'Cameroon',
+    'CV': 'Cape Verde', 'CF': 'Central African Republic', 'TD': 'Chad', 'KM': 'Comoros', 'CG': 'Congo',
+    'CD': 'Democratic Republic of the Congo', 'CR': 'Costa Rica', 'CI': 'Cote D\'Ivoire', 'HR': 'Croatia', 'CU': 'Cuba',
+    'CY': 'Cyprus', 'DJ': 'Djibouti', 'DM': 'Dominica', 'DO': 'Dominican Republic', 'EC': 'Ecuador',
+    'EG': 'Egypt', 'SV': 'El Salvador', 'GQ': 'Equatorial Guinea', 'ER': 'Eritrea', 'EE': 'Estonia',
+    'ET': 'Ethiopia', 'FJ': 'Fiji', 'GA': 'Gabon', 'GM': 'Gambia', 'GE': 'Georgia',
+    'GH': 'Ghana', 'GD': 'Grenada', 'GT': 'Guatemala', 'GN': 'Guinea', 'GW': 'Guinea-Bissau',
+    'GY': 'Guyana', 'HT': 'Haiti', 'HN': 'Honduras', 'IS': 'Iceland', 'IR': 'Iran',
+    'IQ': 'Iraq', 'JM': 'Jamaica', 'JO': 'Jordan', 'KZ': 'Kazakhstan', 'KE': 'Kenya',
+    'KI': 'Kiribati', 'KP': 'North Korea', 'KW': 'Kuwait', 'KG': 'Kyrgyzstan', 'LA': 'Laos',
+    'LV': 'Latvia', 'LB': 'Lebanon', 'LS': 'Lesotho', 'LR': 'Liberia', 'LY': 'Libya',
+    'LI': 'Liechtenstein', 'LT': 'Lithuania', 'LU': 'Luxembourg', 'MK': 'Macedonia', 'MG': 'Madagascar',
+    'MW': 'Malawi', 'MV': 'Maldives', 'ML': 'Mali', 'MT': 'Malta', 'MH': 'Marshall Islands',
+    'MR': 'Mauritania', 'MU': 'Mauritius', 'FM': 'Micronesia', 'MD': 'Moldova', 'MC': 'Monaco',
+    'MN': 'Mongolia', 'ME': 'Montenegro', 'MA': 'Morocco', 'MZ': 'Mozambique', 'MM': 'Myanmar',
+    'NA': 'Namibia', 'NR': 'Nauru', 'NP': 'Nepal', 'NI': 'Nicaragua', 'NE': 'Niger',
+    'NG': 'Nigeria', 'OM': 'Oman', 'PK': 'Pakistan', 'PW': 'Palau', 'PA': 'Panama',
+    'PG': 'Papua New Guinea', 'PY': 'Paraguay', 'PE': 'Peru', 'QA': 'Qatar', 'RW': 'Rwanda',
+    'KN': 'Saint Kitts and Nevis', 'LC': 'Saint Lucia', 'VC': 'Saint Vincent and the Grenadines', 'WS': 'Samoa', 'SM': 'San Marino',
+    'ST': 'Sao Tome and Principe', 'SA': 'Saudi Arabia', 'SN': 'Senegal', 'RS': 'Serbia', 'SC': 'Seychelles',
+    'SL': 'Sierra Leone', 'SK': 'Slovakia', 'SI': 'Slovenia', 'SB': 'Solomon Islands', 'SO': 'Somalia',
+    'LK': 'Sri Lanka', 'SD': 'Sudan', 'SR': 'Suriname', 'SZ': 'Swaziland', 'SY': 'Syria',
+    'TJ': 'Tajikistan', 'TZ': 'Tanzania', 'TL': 'Timor-Leste', 'TG': 'Togo', 'TO': 'Tonga',
+    'TT': 'Trinidad and Tobago', 'TN': 'Tunisia', 'TM': 'Turkmenistan', 'TV': 'Tuvalu', 'UG': 'Uganda',
+    'AE': 'United Arab Emirates', 'UY': 'Uruguay', 'UZ': 'Uzbekistan', 'VU': 'Vanuatu', 'VE': 'Venezuela',
+    'YE': 'Yemen', 'ZM': 'Zambia', 'ZW': 'Zimbabwe'
+}
+
+# Only confirmed keys are remembered: a failed check may be a timeout or rate limit
+VALID_YOUTUBE_KEYS = set()
 
 UrlParseResult = namedtuple(
     'UrlParseResult', ['provider', 'show_id', 'ep_grouping'])
 
 
+@lru_cache(maxsize=1)
+def _base_urls():
+    # type: () -> Tuple[Text, Text]
+    """Image and preview root URLs, resolved once per addon call"""
+    return settings.loadBaseUrls()
+
+
 def get_pinyin_initials(text):
     # TV Shows scraper doesn't have direct access to the daemon client code
     # We need to implement a simple socket client here or import from a shared location
@@ -81,56 +194,69 @@ def get_pinyin_initials(text):
         return ""
     
     try:
-        # Check if daemon port is available
-        import xbmcgui
-        port_prop = xbmcgui.Window(10000).getProperty('TMDB_TV_OPTIMIZATION_SERVICE_PORT')
+        return _query_pinyin_initials(text)
+    except:
+        return ""
+
+
+@lru_cache(maxsize=4096)
+def _query_pinyin_initials(text):
+    # type: (Text) -> Text
+    """
+    Get pinyin initials for a title from the daemon
+
+    Results are memoized because library scans ask for the same titles
+    over and over. Failures raise instead of returning "" so that they
+    are not cached and the daemon is asked again next time.
+    """
+    # Check if daemon port is available
+    port_prop = xbmcgui.Window(10000).getProperty('TMDB_TV_OPTIMIZATION_SERVICE_PORT')
+    if not port_prop:
+        # Try to start daemon via RunScript? 
+        # The movie scraper daemon is shared, so we can try to wake it up
+        import xbmc
+        import time
+        addon_id = 'metadata.tvshows.tmdb.cn.optimization'
+        script_path = 'special://home/addons/{}/daemon.py'.format(addon_id)
+        xbmc.executebuiltin('RunScript({})'.format(script_path))
+        
+        # Wait for port to be available (max 5 seconds)
+        for _ in range(50):
+            if xbmcgui.Window(10000).getProperty('TMDB_TV_OPTIMIZATION_SERVICE_PORT'):
+                port_prop = xbmcgui.Window(10000).getProperty('TMDB_TV_OPTIMIZATION_SERVICE_PORT')
+                break
+            time.sleep(0.1)
+        
         if not port_prop:
-            # Try to start daemon via RunScript? 
-            # The movie scraper daemon is shared, so we can try to wake it up
-            import xbmc
-            import time
-            addon_id = 'metadata.tvshows.tmdb.cn.optimization'
-            script_path = 'special://home/addons/{}/daemon.py'.format(addon_id)
-            xbmc.executebuiltin('RunScript({})'.format(script_path))
-            
-            # Wait for port to be available (max 5 seconds)
-            for _ in range(50):
-                if xbmcgui.Window(10000).getProperty('TMDB_TV_OPTIMIZATION_SERVICE_PORT'):
-                    port_prop = xbmcgui.Window(10000).getProperty('TMDB_TV_OPTIMIZATION_SERVICE_PORT')
-                    break
-                time.sleep(0.1)
-            
-            if not port_prop:
-                return "" # Still not available
+            raise RuntimeError('pinyin daemon is not available')
 
-        service_port = int(port_prop)
-        payload = {'pinyin': text}
+    service_port = int(port_prop)
+    payload = {'pinyin': text}
+    
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(5)
+        s.connect(('127.0.0.1', service_port))
+        s.sendall(json.dumps(payload).encode('utf-8'))
         
-        import socket
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(5)
-            s.connect(('127.0.0.1', service_port))
-            s.sendall(json.dumps(payload).encode('utf-8'))
-            
-            data = b""
-            while True:
-                chunk = s.recv(4096)
-                if not chunk:
-                    break
-                data += chunk
+        data = bytearray()
+        while True:
+            chunk = s.recv(4096)
+            if not chunk:
+                break
+            data.extend(chunk)
+        
+        if not data:
+            raise RuntimeError('pinyin daemon returned no data')
             
-            if not data:
-                return ""
-                
-            response = json.loads(data)
-            return response.get('result', "")
-    except:
-        return ""
+        response = json.loads(data)
+        return response['result']
 
 
 def _clean_plot(plot):
     # type: (Text) -> Text
     """Replace HTML tags with Kodi skin tags"""
+    if '<' not in plot:
+        return plot
     for repl in CLEAN_PLOT_REPLACEMENTS:
         plot = plot.replace(repl[0], repl[1])
     plot = TAG_RE.sub('', plot)
@@ -140,25 +266,23 @@ def _clean_plot(plot):
 def _set_cast(cast_info, vtag, crew_info=None):
     # type: (InfoType, ListItem, Optional[List]) -> ListItem
     """Save cast info to list item"""
-    imagerooturl, previewrooturl = settings.loadBaseUrls()
+    imagerooturl, _ = _base_urls()
     cast = []
     cast_names = set()
+    next_order = 0
     for item in cast_info:
-        actor = {
-            'name': item['name'],
-            'role': item.get('character', item.get('character_name', '')),
-            'order': item['order'],
-        }
         thumb = None
-        if safe_get(item, 'profile_path') is not None:
+        if item.get('profile_path') is not None:
             thumb = imagerooturl + item['profile_path']
-        cast.append(Actor(actor['name'], actor['role'], actor['order'], thumb))
+        cast.append(Actor(item['name'],
+                          item.get('character', item.get('character_name', '')),
+                          item['order'], thumb))
         cast_names.add(item['name'])
+        next_order = max(next_order, item['order'] + 1)
     # Append directors from crew to cast so their thumbnails get written to actor/art tables
     if crew_info:
-        next_order = max((item.get('order', 0) for item in cast_info), default=-1) + 1
         for item in crew_info:
-            if item.get('job') == 'Director' and item.get('name') and item['name'] not in cast_names and safe_get(item, 'profile_path') is not None:
+            if item.get('job') == 'Director' and item.get('name') and item['name'] not in cast_names and item.get('profile_path') is not None:
                 cast.append(Actor(item['name'], 'Director', next_order, imagerooturl + item['profile_path']))
                 cast_names.add(item['name'])
                 next_order += 1
@@ -168,25 +292,23 @@ def _set_cast(cast_info, vtag, crew_info=None):
 def _get_credits(show_info):
     # type: (InfoType) -> List[Text]
     """Extract show creator(s) and writer(s) from show info"""
-    credits = []
-    for item in show_info.get('created_by', []):
-        credits.append(item['name'])
+    credits = [item['name'] for item in show_info.get('created_by', [])]
+    seen = set(credits)
     for item in show_info.get('credits', {}).get('crew', []):
-        isWriter = item.get('job', '').lower() == 'writer' or item.get(
-            'department', '').lower() == 'writing'
-        if isWriter and item.get('name') not in credits:
-            credits.append(item['name'])
+        isWriter = item.get('job') in WRITER_JOBS or item.get(
+            'department') in WRITING_DEPARTMENTS
+        name = item.get('name')
+        if isWriter and name and name not in seen:
+            seen.add(name)
+            credits.append(name)
     return credits
 
 
 def _get_directors(episode_info):
     # type: (InfoType) -> List[Text]
     """Extract episode writer(s) from episode info"""
-    directors_ = []
-    for item in episode_info.get('credits', {}).get('crew', []):
-        if item.get('job') == 'Director':
-            directors_.append(item['name'])
-    return directors_
+    return [item['name'] for item in episode_info.get('credits', {}).get('crew', [])
+            if item.get('job') == 'Director']
 
 
 def _set_unique_ids(ext_ids, vtag):
@@ -209,15 +331,14 @@ def _set_unique_ids(ext_ids, vtag):
 def _set_rating(the_info, vtag):
     # type: (InfoType, ListItem) -> None
     """Set show/episode rating"""
+    ratings = the_info.get('ratings') or {}
     first = True
     for rating_type in SOURCE_SETTINGS["RATING_TYPES"]:
-        logger.debug('adding rating type of %s' % rating_type)
-        rating = float(the_info.get('ratings', {}).get(
-            rating_type, {}).get('rating', '0'))
-        votes = int(the_info.get('ratings', {}).get(
-            rating_type, {}).get('votes', '0'))
-        logger.debug("adding rating of %s and votes of %s" %
-                     (str(rating), str(votes)))
+        logger.debug('adding rating type of %s', rating_type)
+        entry = ratings.get(rating_type) or {}
+        rating = float(entry.get('rating') or 0)
+        votes = int(entry.get('votes') or 0)
+        logger.debug("adding rating of %s and votes of %s", rating, votes)
         if rating > 0:
             vtag.setRating(rating, votes=votes,
                            type=rating_type, isdefault=first)
@@ -228,15 +349,12 @@ def _add_season_info(show_info, vtag):
     # type: (InfoType, ListItem) -> None
     """Add info for show seasons"""
     for season in show_info['seasons']:
-        logger.debug('adding information for season %s to list item' %
+        logger.debug('adding information for season %s to list item',
                      season['season_number'])
         vtag.addSeason(season['season_number'],
-                       safe_get(season, 'name', ''))
+                       season.get('name') or '')
         for image_type, image_list in season.get('images', {}).items():
-            if image_type == 'posters':
-                destination = 'poster'
-            else:
-                destination = image_type
+            destination = ARTWORK_DESTINATIONS.get(image_type, image_type)
             for image in image_list:
                 theurl, previewurl = get_image_urls(image)
                 if theurl:
@@ -247,26 +365,20 @@ def _add_season_info(show_info, vtag):
 def _get_names(item_list):
     # type: (List) -> None
     """Get names from a list of dicts"""
-    items = []
-    for item in item_list:
-        items.append(item['name'])
-    return items
+    return [item['name'] for item in item_list]
 
 
 def get_image_urls(image):
     # type: (Dict) -> Tuple[Text, Text]
     """Get image URLs from image information"""
-    imagerooturl, previewrooturl = settings.loadBaseUrls()
-    if image.get('file_path', '').endswith('.svg'):
-        return None, None
+    file_path = image.get('file_path')
+    if not file_path or file_path.endswith('.svg'):
+        return NO_IMAGE_URLS
     if image.get('type') == 'fanarttv':
-        theurl = image['file_path']
-        previewurl = theurl.replace(
+        return file_path, file_path.replace(
             '.fanart.tv/fanart/', '.fanart.tv/preview/')
-    else:
-        theurl = imagerooturl + image['file_path']
-        previewurl = previewrooturl + image['file_path']
-    return theurl, previewurl
+    imagerooturl, previewrooturl = _base_urls()
+    return imagerooturl + file_path, previewrooturl + file_path
 
 
 def set_show_artwork(show_info, list_item):
@@ -286,12 +398,7 @@ def set_show_artwork(show_info, list_item):
             if fanart_list:
                 list_item.setAvailableFanart(fanart_list)
         else:
-            if image_type == 'posters':
-                destination = 'poster'
-            elif image_type == 'logos':
-                destination = 'clearlogo'
-            else:
-                destination = image_type
+            destination = ARTWORK_DESTINATIONS.get(image_type, image_type)
             for image in image_list:
                 theurl, previewurl = get_image_urls(image)
                 if theurl:
@@ -303,7 +410,6 @@ def set_show_artwork(show_info, list_item):
 def add_main_show_info(list_item, show_info, full_info=True):
     # type: (ListItem, InfoType, bool) -> ListItem
     """Add main show info to a list item"""
-    imagerooturl, previewrooturl = settings.loadBaseUrls()
     vtag = list_item.getVideoInfoTag()
     original_name = show_info.get('original_name')
     if SOURCE_SETTINGS["KEEPTITLE"] and original_name:
@@ -326,7 +432,7 @@ def add_main_show_info(list_item, show_info, full_info=True):
             else:
                 original_name = "{}|{}".format(pinyin_initials, showname)
 
-    plot = _clean_plot(safe_get(show_info, 'overview', ''))
+    plot = _clean_plot(show_info.get('overview') or '')
     vtag.setTitle(showname)
     vtag.setOriginalTitle(original_name)
     vtag.setTvShowTitle(showname)
@@ -341,7 +447,7 @@ def add_main_show_info(list_item, show_info, full_info=True):
         vtag.setYear(int(show_info['first_air_date'][:4]))
         vtag.setPremiered(show_info['first_air_date'])
     if full_info:
-        vtag.setTvShowStatus(safe_get(show_info, 'status', ''))
+        vtag.setTvShowStatus(show_info.get('status') or '')
         vtag.setGenres(_get_names(show_info.get('genres', [])))
         
         # 处理 Tags (关键词 + 国家)
@@ -351,92 +457,9 @@ def add_main_show_info(list_item, show_info, full_info=True):
         
         # 将 origin_country 转换为英文全名标签 (与筛选器 library.py 保持一致)
         origin_countries = show_info.get('origin_country', [])
-        # 国家代码映射表 (ISO 3166-1 alpha-2 -> English Full Name)
-        # 参考 library.py 中的映射逻辑
-        COUNTRY_MAP = {
-            'CN': 'China',          # 内地
-            'HK': 'Hong Kong',      # 中国香港
-            'TW': 'Taiwan',         # 中国台湾
-            'US': 'United States',  # 美国
-            'JP': 'Japan',          # 日本
-            'KR': 'South Korea',    # 韩国
-            'TH': 'Thailand',       # 泰国
-            'IN': 'India',          # 印度
-            'GB': 'United Kingdom', # 英国
-            'FR': 'France',         # 法国
-            'DE': 'Germany',        # 德国
-            'RU': 'Russia',         # 俄罗斯
-            'CA': 'Canada',         # 加拿大
-            # 补充常见国家
-            'AU': 'Australia',      # 澳大利亚
-            'IT': 'Italy',          # 意大利
-            'ES': 'Spain',          # 西班牙
-            'BR': 'Brazil',         # 巴西
-            'MX': 'Mexico',         # 墨西哥
-            'SE': 'Sweden',         # 瑞典
-            'NO': 'Norway',         # 挪威
-            'DK': 'Denmark',        # 丹麦
-            'NL': 'Netherlands',    # 荷兰
-            'PL': 'Poland',         # 波兰
-            'TR': 'Turkey',         # 土耳其
-            'ID': 'Indonesia',      # 印度尼西亚
-            'PH': 'Philippines',    # 菲律宾
-            'SG': 'Singapore',      # 新加坡
-            'MY': 'Malaysia',       # 马来西亚
-            'VN': 'Vietnam',        # 越南
-            'ZA': 'South Africa',   # 南非
-            'NZ': 'New Zealand',    # 新西兰
-            'IE': 'Ireland',        # 爱尔兰
-            'BE': 'Belgium',        # 比利时
-            'CH': 'Switzerland',    # 瑞士
-            'AT': 'Austria',        # 奥地利
-            'FI': 'Finland',        # 芬兰
-            'PT': 'Portugal',       # 葡萄牙
-            'GR': 'Greece',         # 希腊
-            'IL': 'Israel',         # 以色列
-            'AR': 'Argentina',      # 阿根廷
-            'CL': 'Chile',          # 智利
-            'CO': 'Colombia',       # 哥伦比亚
-            'UA': 'Ukraine',        # 乌克兰
-            'CZ': 'Czech Republic', # 捷克
-            'HU': 'Hungary',        # 匈牙利
-            'RO': 'Romania',        # 罗马尼亚
-            # 更多国家补充
-            'AF': 'Afghanistan', 'AL': 'Albania', 'DZ': 'Algeria', 'AD': 'Andorra', 'AO': 'Angola',
-            'AG': 'Antigua and Barbuda', 'AM': 'Armenia', 'AZ': 'Azerbaijan', 'BS': 'Bahamas', 'BH': 'Bahrain',
-            'BD': 'Bangladesh', 'BB': 'Barbados', 'BY': 'Belarus', 'BZ': 'Belize', 'BJ': 'Benin',
-            'BT': 'Bhutan', 'BO': 'Bolivia', 'BA': 'Bosnia and Herzegovina', 'BW': 'Botswana', 'BN': 'Brunei Darussalam',
-            'BG': 'Bulgaria', 'BF': 'Burkina Faso', 'BI': 'Burundi', 'KH': 'Cambodia', 'CM': 'Cameroon',
-            'CV': 'Cape Verde', 'CF': 'Central African Republic', 'TD': 'Chad', 'KM': 'Comoros', 'CG': 'Congo',
-            'CD': 'Democratic Republic of the Congo', 'CR': 'Costa Rica', 'CI': 'Cote D\'Ivoire', 'HR': 'Croatia', 'CU': 'Cuba',
-            'CY': 'Cyprus', 'DJ': 'Djibouti', 'DM': 'Dominica', 'DO': 'Dominican Republic', 'EC': 'Ecuador',
-            'EG': 'Egypt', 'SV': 'El Salvador', 'GQ': 'Equatorial Guinea', 'ER': 'Eritrea', 'EE': 'Estonia',
-            'ET': 'Ethiopia', 'FJ': 'Fiji', 'GA': 'Gabon', 'GM': 'Gambia', 'GE': 'Georgia',
-            'GH': 'Ghana', 'GD': 'Grenada', 'GT': 'Guatemala', 'GN': 'Guinea', 'GW': 'Guinea-Bissau',
-            'GY': 'Guyana', 'HT': 'Haiti', 'HN': 'Honduras', 'IS': 'Iceland', 'IR': 'Iran',
-            'IQ': 'Iraq', 'JM': 'Jamaica', 'JO': 'Jordan', 'KZ': 'Kazakhstan', 'KE': 'Kenya',
-            'KI': 'Kiribati', 'KP': 'North Korea', 'KW': 'Kuwait', 'KG': 'Kyrgyzstan', 'LA': 'Laos',
-            'LV': 'Latvia', 'LB': 'Lebanon', 'LS': 'Lesotho', 'LR': 'Liberia', 'LY': 'Libya',
-            'LI': 'Liechtenstein', 'LT': 'Lithuania', 'LU': 'Luxembourg', 'MK': 'Macedonia', 'MG': 'Madagascar',
-            'MW': 'Malawi', 'MV': 'Maldives', 'ML': 'Mali', 'MT': 'Malta', 'MH': 'Marshall Islands',
-            'MR': 'Mauritania', 'MU': 'Mauritius', 'FM': 'Micronesia', 'MD': 'Moldova', 'MC': 'Monaco',
-            'MN': 'Mongolia', 'ME': 'Montenegro', 'MA': 'Morocco', 'MZ': 'Mozambique', 'MM': 'Myanmar',
-            'NA': 'Namibia', 'NR': 'Nauru', 'NP': 'Nepal', 'NI': 'Nicaragua', 'NE': 'Niger',
-            'NG': 'Nigeria', 'OM': 'Oman', 'PK': 'Pakistan', 'PW': 'Palau', 'PA': 'Panama',
-            'PG': 'Papua New Guinea', 'PY': 'Paraguay', 'PE': 'Peru', 'QA': 'Qatar', 'RW': 'Rwanda',
-            'KN': 'Saint Kitts and Nevis', 'LC': 'Saint Lucia', 'VC': 'Saint Vincent and the Grenadines', 'WS': 'Samoa', 'SM': 'San Marino',
-            'ST': 'Sao Tome and Principe', 'SA': 'Saudi Arabia', 'SN': 'Senegal', 'RS': 'Serbia', 'SC': 'Seychelles',
-            'SL': 'Sierra Leone', 'SK': 'Slovakia', 'SI': 'Slovenia', 'SB': 'Solomon Islands', 'SO': 'Somalia',
-            'LK': 'Sri Lanka', 'SD': 'Sudan', 'SR': 'Suriname', 'SZ': 'Swaziland', 'SY': 'Syria',
-            'TJ': 'Tajikistan', 'TZ': 'Tanzania', 'TL': 'Timor-Leste', 'TG': 'Togo', 'TO': 'Tonga',
-            'TT': 'Trinidad and Tobago', 'TN': 'Tunisia', 'TM': 'Turkmenistan', 'TV': 'Tuvalu', 'UG': 'Uganda',
-            'AE': 'United Arab Emirates', 'UY': 'Uruguay', 'UZ': 'Uzbekistan', 'VU': 'Vanuatu', 'VE': 'Venezuela',
-            'YE': 'Yemen', 'ZM': 'Zambia', 'ZW': 'Zimbabwe'
-        }
-        for code in origin_countries:
-            if code in COUNTRY_MAP:
-                tags.append(COUNTRY_MAP[code])
-            # else: tags.append(code) # 可选：保留未映射的代码
+        # 未映射的代码不写入标签
+        tags.extend(COUNTRY_MAP[code]
+                    for code in origin_countries if code in COUNTRY_MAP)
             
         if tags:
             vtag.setTags(tags)
@@ -457,16 +480,11 @@ def add_main_show_info(list_item, show_info, full_info=True):
         content_ratings = show_info.get(
             'content_ratings', {}).get('results', {})
         if content_ratings:
-            mpaa = ''
-            mpaa_backup = ''
-            for content_rating in content_ratings:
-                iso = content_rating.get('iso_3166_1', '').lower()
-                if iso == 'us':
-                    mpaa_backup = content_rating.get('rating')
-                if iso == SOURCE_SETTINGS["CERT_COUNTRY"].lower():
-                    mpaa = content_rating.get('rating', '')
-            if not mpaa:
-                mpaa = mpaa_backup
+            ratings_by_iso = {content_rating.get('iso_3166_1', '').lower(): content_rating.get('rating', '')
+                              for content_rating in content_ratings}
+            # fall back to the US certification
+            mpaa = ratings_by_iso.get(SOURCE_SETTINGS["CERT_COUNTRY"].lower()) or \
+                ratings_by_iso.get('us')
             if mpaa:
                 vtag.setMpaa(SOURCE_SETTINGS["CERT_PREFIX"] + mpaa)
         vtag.setWriters(_get_credits(show_info))
@@ -483,11 +501,12 @@ def add_main_show_info(list_item, show_info, full_info=True):
     else:
         image = show_info.get('poster_path', '')
         if image and not image.endswith('.svg'):
+            imagerooturl, previewrooturl = _base_urls()
             theurl = imagerooturl + image
             previewurl = previewrooturl + image
             vtag.addAvailableArtwork(
                 theurl, arttype='poster', preview=previewurl)
-    logger.debug('adding tv show information for %s to list item' % showname)
+    logger.debug('adding tv show information for %s to list item', showname)
     return list_item
 
 
@@ -501,22 +520,22 @@ def add_episode_info(list_item, episode_info, full_info=True):
     vtag.setSeason(episode_info['season_number'])
     vtag.setEpisode(episode_info['episode_number'])
     vtag.setMediaType('episode')
-    if safe_get(episode_info, 'air_date') is not None:
+    if episode_info.get('air_date') is not None:
         vtag.setFirstAired(episode_info['air_date'])
     if full_info:
-        summary = safe_get(episode_info, 'overview')
+        summary = episode_info.get('overview')
         if summary is not None:
             plot = _clean_plot(summary)
             vtag.setPlot(plot)
             vtag.setPlotOutline(plot)
-        if safe_get(episode_info, 'air_date') is not None:
+        if episode_info.get('air_date') is not None:
             vtag.setPremiered(episode_info['air_date'])
         duration = episode_info.get('runtime')
         if duration:
             videostream = VideoStreamDetail(duration=int(duration)*60)
             vtag.addVideoStream(videostream)
         _set_cast(
-            episode_info['season_cast'] + episode_info['credits']['guest_stars'], vtag,
+            chain(episode_info['season_cast'], episode_info['credits']['guest_stars']), vtag,
             crew_info=episode_info.get('credits', {}).get('crew', []))
         ext_ids = {'tmdb_id': episode_info['id']}
         ext_ids.update(episode_info.get('external_ids', {}))
@@ -529,8 +548,8 @@ def add_episode_info(list_item, episode_info, full_info=True):
                     theurl, arttype='thumb', preview=previewurl)
         vtag.setWriters(_get_credits(episode_info))
         vtag.setDirectors(_get_directors(episode_info))
-    logger.debug('adding episode information for S%sE%s - %s to list item' %
-                 (episode_info['season_number'], episode_info['episode_number'], title))
+    logger.debug('adding episode information for S%sE%s - %s to list item',
+                 episode_info['season_number'], episode_info['episode_number'], title)
     return list_item
 
 
@@ -538,17 +557,17 @@ def parse_nfo_url(nfo):
     # type: (Text) -> Optional[UrlParseResult]
     """Extract show ID and named seasons from NFO file contents"""
     # work around for xbmcgui.ListItem.addSeason overwriting named seasons from NFO files
-    ns_regex = r'<namedseason number="(.*)">(.*)</namedseason>'
-    ns_match = re.findall(ns_regex, nfo, re.I)
+    ns_match = NAMED_SEASON_RE.findall(nfo)
     sid_match = None
     ep_grouping = None
-    for regexp in SHOW_ID_REGEXPS:
-        logger.debug('trying regex to match service from parsing nfo:')
-        logger.debug(regexp)
-        show_id_match = re.search(regexp, nfo, re.I)
+    for regexp in _COMPILED_SHOW_ID_REGEXPS:
+        if logger.debug_enabled:
+            logger.debug('trying regex to match service from parsing nfo:')
+            logger.debug(regexp.pattern)
+        show_id_match = regexp.search(nfo)
         if show_id_match:
-            logger.debug('match group 1: ' + show_id_match.group(1))
-            logger.debug('match group 2: ' + show_id_match.group(2))
+            logger.debug('match group 1: %s', show_id_match.group(1))
+            logger.debug('match group 2: %s', show_id_match.group(2))
             if show_id_match.group(1) == "themoviedb" or show_id_match.group(1) == "tmdb":
                 try:
                     ep_grouping = show_id_match.group(3)
@@ -559,49 +578,49 @@ def parse_nfo_url(nfo):
                 tmdb_id = _convert_ext_id(
                     show_id_match.group(1), show_id_match.group(2))
             if tmdb_id:
-                logger.debug('match group 3: ' + str(ep_grouping))
+                logger.debug('match group 3: %s', ep_grouping)
                 sid_match = UrlParseResult('tmdb', tmdb_id, ep_grouping)
                 break
     return sid_match, ns_match
 
 
 def _convert_ext_id(ext_provider, ext_id):
-    # type: (Text, Text) -> Text
+    # type: (Text, Text) -> Optional[Text]
     """get a TMDb ID from an external ID"""
     providers_dict = {'imdb': 'imdb_id',
                       'thetvdb': 'tvdb_id',
                       'tvdb': 'tvdb_id'}
+    provider = providers_dict.get(ext_provider)
+    if not provider:
+        return None
+    tmdb_id = cache.load_tmdb_id_from_cache(provider, ext_id)
+    if tmdb_id is not None:
+        logger.debug('using cached TMDb ID for %s %s', provider, ext_id)
+        return tmdb_id or None
     show_url = FIND_URL.format(ext_id)
     params = {'api_key': settings.TMDB_CLOWNCAR,
-              'language': SOURCE_SETTINGS["LANG_DETAILS"]}
-    provider = providers_dict.get(ext_provider)
-    if provider:
-        params['external_source'] = provider
-        show_info = api_utils.load_info(show_url, params=params)
-    else:
-        show_info = None
-    if show_info:
-        tv_results = show_info.get('tv_results')
-        if tv_results:
-            return tv_results[0].get('id')
-    return None
+              'language': SOURCE_SETTINGS["LANG_DETAILS"],
+              'external_source': provider}
+    show_info = api_utils.load_info(show_url, params=params)
+    if not show_info:
+        # request failed, don't remember it as a miss
+        return None
+    tv_results = show_info.get('tv_results')
+    tmdb_id = tv_results[0].get('id') if tv_results else None
+    if tmdb_id is not None:
+        # same type as the cached IDs and the IDs parsed from NFO links
+        tmdb_id = str(tmdb_id)
+    cache.cache_tmdb_id(provider, ext_id, tmdb_id)
+    return tmdb_id
 
 
 def parse_media_id(title):
     # type: (Text) -> Dict
     """get the ID from a title and return with the type"""
-    title = title.lower()
-    if title.startswith('tt') and title[2:].isdigit():
-        # IMDB ID works alone because it is clear
-        return {'type': 'imdb_id', 'title': title}
-    # IMDB ID with prefix to match
-    elif title.startswith('imdb/tt') and title[7:].isdigit():
-        # IMDB ID works alone because it is clear
-        return {'type': 'imdb_id', 'title': title[5:]}
-    elif title.startswith('tmdb/') and title[5:].isdigit():  # TMDB ID
-        return {'type': 'tmdb_id', 'title': title[5:]}
-    elif title.startswith('tvdb/') and title[5:].isdigit():  # TVDB ID
-        return {'type': 'tvdb_id', 'title': title[5:]}
+    match = MEDIA_ID_RE.fullmatch(title.lower())
+    if match:
+        return {'type': MEDIA_ID_TYPES[match.lastindex - 1],
+                'title': match.group(match.lastindex)}
     return None
 
 
@@ -613,11 +632,16 @@ def _parse_trailer(results):
             addon_player = 'plugin://plugin.video.tubed/?mode=play&video_id='
         elif SOURCE_SETTINGS["PLAYERSOPT"] == 'youtube':
             addon_player = 'plugin://plugin.video.youtube/play/?video_id='
-        backup_keys = []
+        checked_keys = set()
         for video_lang in [SOURCE_SETTINGS["LANG_DETAILS"][0:2], 'en']:
+            # backups from a previous language were already checked and failed
+            backup_keys = []
             for result in results:
                 if result.get('site') == 'YouTube' and result.get('iso_639_1') == video_lang:
                     key = result.get('key')
+                    if key in checked_keys:
+                        continue
+                    checked_keys.add(key)
                     if result.get('type') == 'Trailer':
                         if _check_youtube(key):
                             # video is available and is defined as "Trailer" by TMDB. Perfect link!
@@ -634,8 +658,11 @@ def _parse_trailer(results):
 def _check_youtube(key):
     # type: (Text) -> bool
     """check to see if the YouTube key returns a valid link"""
+    if key in VALID_YOUTUBE_KEYS:
+        return True
     chk_link = "https://www.youtube.com/watch?v="+key
     check = api_utils.load_info(chk_link, resp_type='not_json')
     if not check or "Video unavailable" in check:       # video not available
         return False
+    VALID_YOUTUBE_KEYS.add(key)
     return True
@@ -85,7 +85,7 @@ def _assemble_imdb_result(votes, rating):
 def _parse_imdb_result(input_html):
     # type: (Text) -> Tuple[Text, Text]
     """parse the IMDB ratings from the JSON in the raw HTML"""
-    match = re.search(IMDB_JSON_REGEX, input_html)
+    match = IMDB_JSON_REGEX.search(input_html)
     if not match:
         return None, None
     imdb_json = json.loads(match.group(1))
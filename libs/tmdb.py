@@ -97,15 +97,15 @@ def search_show(title, year=None):
     base_url = get_base_url(source_settings)
     
     if ext_media_id:
-        logger.debug('using %s of %s to find show' %
-                     (ext_media_id['type'], ext_media_id['title']))
+        logger.debug('using %s of %s to find show',
+                     ext_media_id['type'], ext_media_id['title'])
         if ext_media_id['type'] == 'tmdb_id':
             search_url = base_url.format('tv/{}').format(ext_media_id['title'])
         else:
             search_url = base_url.format('find/{}').format(ext_media_id['title'])
             params['external_source'] = ext_media_id['type']
     else:
-        logger.debug('using title of %s to find show' % title)
+        logger.debug('using title of %s to find show', title)
         search_url = base_url.format('search/tv')
         params['query'] = unicodedata.normalize('NFKC', title)
         if year:
@@ -283,8 +283,8 @@ def load_show_info(show_id, ep_grouping=None, named_seasons=None):
             # this is part of a work around for xbmcgui.ListItem.addSeasons() not respecting NFO file information
             for named_season in named_seasons:
                 if str(named_season[0]) == str(season.get('season_number')):
-                    logger.debug('adding season name of %s from named seasons in NFO for season %s' % (
-                        named_season[1], season['season_number']))
+                    logger.debug('adding season name of %s from named seasons in NFO for season %s',
+                                 named_season[1], season['season_number'])
                     season_info['name'] = named_season[1]
                     break
             # end work around
@@ -403,7 +403,7 @@ def load_ratings(the_info, show_imdb_id=''):
     ratings = {}
     imdb_id = the_info.get('external_ids', {}).get('imdb_id')
     for rating_type in source_settings["RATING_TYPES"]:
-        logger.debug('setting rating using %s' % rating_type)
+        logger.debug('setting rating using %s', rating_type)
         if rating_type == 'tmdb':
             ratings['tmdb'] = {'votes': the_info['vote_count'],
                                'rating': the_info['vote_average']}
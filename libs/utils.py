@@ -35,38 +35,46 @@ ADDON = Addon()
 class logger:
     log_message_prefix = '[{} ({})]: '.format(
         ADDON_ID, ADDON.getAddonInfo('version'))
+    debug_enabled = True
 
     @staticmethod
-    def log(message, level=xbmc.LOGDEBUG):
-        # type: (Text, int) -> None
+    def refresh_debug_enabled():
+        # type: () -> None
+        """
+        Check once whether debug logging is switched on in the settings
+
+        This does not see debug logging enabled through advancedsettings.xml
+        or --debug, so it only gates optional high-volume traces; debug()
+        itself always logs.
+        """
+        logger.debug_enabled = bool(
+            xbmc.getCondVisibility('System.GetBool(debug.showloginfo)') or
+            ADDON.getSettingBool('verboselog'))
+
+    @staticmethod
+    def log(message, level=xbmc.LOGDEBUG, args=()):
+        # type: (Text, int, tuple) -> None
         if isinstance(message, bytes):
             message = message.decode('utf-8')
+        if args:
+            message = message % args
         message = logger.log_message_prefix + message
         xbmc.log(message, level)
 
     @staticmethod
-    def info(message):
-        # type: (Text) -> None
-        logger.log(message, xbmc.LOGINFO)
+    def info(message, *args):
+        # type: (Text, *Any) -> None
+        logger.log(message, xbmc.LOGINFO, args)
 
     @staticmethod
-    def error(message):
-        # type: (Text) -> None
-        logger.log(message, xbmc.LOGERROR)
+    def error(message, *args):
+        # type: (Text, *Any) -> None
+        logger.log(message, xbmc.LOGERROR, args)
 
     @staticmethod
-    def debug(message):
-        # type: (Text) -> None
-        logger.log(message, xbmc.LOGDEBUG)
-
+    def debug(message, *args):
+        # type: (Text, *Any) -> None
+        logger.log(message, xbmc.LOGDEBUG, args)
 
-def safe_get(dct, key, default=None):
-    # type: (Dict[Text, Any], Text, Any) -> Any
-    """
-    Get a key from dict
 
-    Returns the respective value or default if key is missing or the value is None.
-    """
-    if key in dct and dct[key] is not None:
-        return dct[key]
-    return default
+logger.refresh_debug_enabled()